@@ -1,2 +1,3 @@
 EXCLUDE_DIRS = {"@eaDir", 'temp', 'clips' , 'original_json' , "huggingface_benchmarks_original_dataset", "@SynoEAStream",
-                "._.DS_Store" ,".DS_Store" , "Thumbs.db",".qodo" , ".gitignore" , ".s" , ".t" , "sstar.format" , "flipped_gpu_high"}
\ No newline at end of file
+                "._.DS_Store" ,".DS_Store" , "Thumbs.db",".qodo" , ".gitignore" , ".s" , ".t" , "sstar.format" , "flipped_gpu_high"}
+SPLIT_NAMES = ("train", "val", "test")
@@ -0,0 +1,186 @@
+import os
+import numpy as np
+from PIL import Image
+from scipy.io import loadmat
+from concurrent.futures import ProcessPoolExecutor
+from utils.logger import custom_logger
+from utils.image_files import collect_images
+
+logger = custom_logger(__name__)
+
+INTEGRAL_SUFFIX = "_integral.npz"
+
+
+def build_count_integral(points, image_size, cell_size=16):
+    """
+    점 좌표로부터 격자 단위 점 개수의 누적합 테이블(summed-area table)을 만듭니다.
+
+    Args:
+        points (np.ndarray): 점 좌표 (N, 2) x, y
+        image_size (tuple): 원본 이미지 크기 (width, height)
+        cell_size (int): 격자 한 칸의 크기(픽셀)
+
+    Returns:
+        np.ndarray: (ny + 1, nx + 1) 크기의 누적합 테이블 (첫 행/열은 0)
+    """
+    width, height = image_size
+    nx = (width + cell_size - 1) // cell_size
+    ny = (height + cell_size - 1) // cell_size
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    # 이미지 경계를 살짝 벗어난 점도 가장자리 칸에 포함되도록 잘라냄
+    xs = np.clip(points[:, 0], 0, width - 1e-3)
+    ys = np.clip(points[:, 1], 0, height - 1e-3)
+
+    hist, _, _ = np.histogram2d(
+        ys, xs,
+        bins=[ny, nx],
+        range=[[0, ny * cell_size], [0, nx * cell_size]]
+    )
+
+    table = np.zeros((ny + 1, nx + 1), dtype=np.int64)
+    table[1:, 1:] = hist.cumsum(axis=0).cumsum(axis=1)
+
+    dtype = np.uint16 if len(points) <= np.iinfo(np.uint16).max else np.int32
+    return table.astype(dtype)
+
+
+def load_count_integral(integral_path):
+    """
+    저장된 누적합 테이블을 읽어옵니다.
+
+    Args:
+        integral_path (str): *_integral.npz 파일 경로
+
+    Returns:
+        dict: table (np.ndarray), cell_size (int), image_size (tuple) 정보
+    """
+    with np.load(integral_path) as data:
+        return {
+            "table": data["table"].astype(np.int64),
+            "cell_size": int(data["cell_size"]),
+            "image_size": tuple(int(v) for v in data["image_size"])
+        }
+
+
+def query_count(integral, x1, y1, x2, y2):
+    """
+    사각형 영역 내부의 점 개수를 O(1)로 반환합니다.
+    시작 경계(x1, y1)는 내림, 끝 경계(x2, y2)는 올림으로 격자(cell_size) 경계에 맞추므로
+    사각형 안의 점은 항상 포함되며, 오차는 각 변마다 바깥쪽으로 최대 한 칸(cell_size 픽셀)입니다.
+    격자에 정렬된 크롭이면 정확한 값이고, 이미지 경계 이상의 좌표는 마지막 칸(부분 칸 포함)까지로 처리됩니다.
+
+    Args:
+        integral (dict): load_count_integral의 반환값
+        x1, y1, x2, y2 (float | np.ndarray): 원본 픽셀 좌표 기준 사각형 (배열이면 여러 사각형 동시 조회)
+
+    Returns:
+        int | np.ndarray: 사각형 내부 점 개수 (각 변마다 최대 한 칸만큼 과대 집계될 수 있음)
+    """
+    table = integral["table"]
+    cell_size = integral["cell_size"]
+    width, height = integral["image_size"]
+    ny, nx = table.shape[0] - 1, table.shape[1] - 1
+
+    def _to_grid(v, limit, n, rounding):
+        v = np.asarray(v, dtype=np.float64)
+        # 이미지 경계 이상은 마지막 부분 칸까지 포함하도록 n으로 고정
+        g = np.where(v >= limit, n, rounding(v / cell_size))
+        return np.clip(g, 0, n).astype(np.intp)
+
+    c1 = _to_grid(x1, width, nx, np.floor)
+    c2 = _to_grid(x2, width, nx, np.ceil)
+    r1 = _to_grid(y1, height, ny, np.floor)
+    r2 = _to_grid(y2, height, ny, np.ceil)
+
+    count = table[r2, c2] - table[r1, c2] - table[r2, c1] + table[r1, c1]
+    count = np.maximum(count, 0)
+    return int(count) if np.ndim(count) == 0 else count
+
+
+def _build_one(task):
+    """워커 프로세스에서 이미지 한 장의 누적합 테이블을 만들어 저장합니다."""
+    mat_path, image_path, save_path, cell_size = task
+    try:
+        with Image.open(image_path) as img:
+            image_size = img.size  # 헤더만 읽으므로 디코딩 비용 없음
+        points = loadmat(mat_path).get('annPoints', np.zeros((0, 2)))
+        table = build_count_integral(points, image_size, cell_size)
+        np.savez(
+            save_path,
+            table=table,
+            cell_size=np.int32(cell_size),
+            image_size=np.array(image_size, dtype=np.int32)
+        )
+    except Exception as e:
+        return mat_path, str(e)
+    return mat_path, None
+
+
+def build_count_integrals(image_folders, output_base_path, cell_size=16, num_workers=None, force=False):
+    """
+    mats/ 폴더의 MAT 파일에 대해 점 개수 누적합 테이블을 만들어 MAT 파일 옆에 저장합니다.
+    (mats/0001.mat -> mats/0001_integral.npz)
+    테이블이 MAT 파일보다 최신이면 건너뛰므로, 증분 수집으로 갱신된 MAT 파일만 다시 만듭니다.
+
+    Args:
+        image_folders (str | list): 이미지 폴더 경로 (이미지 크기 확인용, images_partN 여러 개 가능)
+        output_base_path (str): mats/ 폴더가 있는 기본 경로
+        cell_size (int): 격자 한 칸의 크기(픽셀)
+        num_workers (int): 워커 프로세스 수 (None이면 CPU 수)
+        force (bool): True면 최신 여부와 관계없이 모두 다시 생성 (cell_size 변경 시 사용)
+
+    Returns:
+        dict: 처리 결과 및 통계 정보
+    """
+    mats_folder = os.path.join(output_base_path, 'mats')
+    if not os.path.exists(mats_folder):
+        logger.error(f"MAT 폴더가 존재하지 않습니다: {mats_folder}")
+        return {"error": f"MAT 폴더가 존재하지 않습니다: {mats_folder}"}
+
+    images = collect_images(image_folders)
+
+    # 폴더를 한 번만 훑어 MAT/테이블 파일의 수정시각을 모음
+    mtimes = {}
+    with os.scandir(mats_folder) as it:
+        for entry in it:
+            if entry.name.endswith(('.mat', INTEGRAL_SUFFIX)):
+                mtimes[entry.name] = entry.stat().st_mtime
+
+    tasks = []
+    skipped = 0
+    for file in sorted(f for f in mtimes if f.endswith('.mat')):
+        basename = os.path.splitext(file)[0]
+        integral_file = f"{basename}{INTEGRAL_SUFFIX}"
+        if not force and mtimes.get(integral_file, -1) >= mtimes[file]:
+            skipped += 1
+            continue
+        if basename not in images:
+            logger.warning(f"경고: {file}에 대응하는 이미지 파일이 없습니다. 건너뜁니다.")
+            continue
+        tasks.append((
+            os.path.join(mats_folder, file),
+            images[basename],
+            os.path.join(mats_folder, integral_file),
+            cell_size
+        ))
+
+    logger.info(f"누적합 테이블 생성 중... ({len(tasks)}개, 최신 {skipped}개 건너뜀, 격자 {cell_size}px)")
+
+    num_workers = num_workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (num_workers * 8))
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for mat_path, error in executor.map(_build_one, tasks, chunksize=chunksize):
+            if error:
+                failed += 1
+                logger.error(f"오류 발생 ({os.path.basename(mat_path)}): {error}")
+
+    logger.info(f"총 {len(tasks) - failed}개 테이블 생성, {failed}개 실패. 결과는 {mats_folder}에 저장되었습니다.")
+
+    return {
+        "built": len(tasks) - failed,
+        "skipped": skipped,
+        "failed": failed
+    }
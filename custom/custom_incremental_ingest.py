@@ -0,0 +1,647 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+from PIL import Image
+from extractor.annotation_img_extract import extract_frames
+from custom.custom_json_to_mat import save_annotation_mat
+from utils.logger import custom_logger
+from utils.image_files import IMAGE_EXTENSIONS
+from config.config import EXCLUDE_DIRS, SPLIT_NAMES
+
+logger = custom_logger(__name__)
+
+SPLIT_LINE_MAX_BYTES = 32
+SCHEMA_VERSION = 2
+# 파일이 제자리에서 덮어써졌을 수 있어(예: 프레임 재추출) 다음 스캔에서 모든 파일을 다시 확인해야 하는 폴더
+DIR_DIRTY = -1.0
+# 기록 중인 파일이 있어 다음 스캔에서 다시 나열해야 하는 폴더 (기록된 파일은 다시 stat 하지 않음)
+DIR_PENDING = -2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    key TEXT NOT NULL,
+    stem TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS files_kind_key ON files (kind, key);
+CREATE INDEX IF NOT EXISTS files_kind_stem ON files (kind, stem);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS items (
+    name TEXT PRIMARY KEY,
+    nwpu_id INTEGER NOT NULL UNIQUE,
+    split TEXT NOT NULL,
+    split_written INTEGER NOT NULL DEFAULT 0,
+    image_path TEXT NOT NULL,
+    label_path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_label ON items (label_path);
+"""
+
+
+def open_state_db(db_path):
+    """
+    처리 이력을 저장하는 상태 DB(sqlite)를 열고 스키마를 준비합니다.
+
+    files 테이블의 status는 다음 중 하나입니다.
+        - done: 처리 완료
+        - pending: 확인했지만 짝(이미지/라벨)이 아직 없음
+        - failed: 처리 실패 (파일의 크기/수정시각이 바뀔 때까지 다시 시도하지 않음)
+
+    Args:
+        db_path (str): 상태 DB 파일 경로
+
+    Returns:
+        sqlite3.Connection: DB 연결 객체
+
+    Raises:
+        ValueError: 기존 DB의 스키마 버전이 다른 경우
+    """
+    conn = sqlite3.connect(db_path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    has_tables = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+    if has_tables and version != SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"상태 DB 스키마 버전이 다릅니다 (DB: {version}, 필요: {SCHEMA_VERSION}): {db_path}")
+
+    conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+    return conn
+
+
+def _rel_key(path, root):
+    """root 기준 상대 경로(확장자 제외, '/' 구분)를 반환합니다. 예: TEST001/cam_frame0"""
+    return os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, '/')
+
+
+def _scan(conn, root, extensions, settle_before, full=False):
+    """
+    root 아래에서 새로 생기거나 바뀐 파일을 찾습니다.
+    수정시각이 기록과 같은 폴더는 나열하지 않고 기록된 하위 폴더만 따라가며,
+    바뀐 폴더에서도 기록에 없는 파일만 stat 하므로 비용은 새 데이터에 비례합니다.
+    제자리에서 내용만 바뀐 파일(폴더 수정시각이 그대로인 경우)은 full=True 스캔에서 찾습니다.
+
+    Args:
+        conn (sqlite3.Connection): 상태 DB
+        root (str): 탐색할 최상위 폴더
+        extensions (tuple): 대상 확장자
+        settle_before (float): 이 시각 이후에 수정된 파일은 기록 중으로 보고 다음 배치로 미룸
+        full (bool): True면 모든 폴더를 나열하고 모든 파일을 stat
+
+    Returns:
+        tuple: ([(경로, 크기, 수정시각), ...] 변경 파일, {폴더: (상위 폴더, 수정시각)} 갱신할 폴더 기록)
+    """
+    changed = []
+    dir_updates = {}
+    if not os.path.isdir(root):
+        return changed, dir_updates
+
+    stack = [(root, None)]
+    while stack:
+        current, parent = stack.pop()
+        try:
+            dir_mtime = os.stat(current).st_mtime
+        except FileNotFoundError:
+            continue
+
+        row = conn.execute("SELECT mtime FROM dirs WHERE path = ?", (current,)).fetchone()
+        recorded = row[0] if row else None
+        if not full and recorded == dir_mtime:
+            stack.extend(
+                (path, current)
+                for (path,) in conn.execute("SELECT path FROM dirs WHERE parent = ?", (current,))
+            )
+            continue
+
+        stat_all = full or recorded == DIR_DIRTY
+        known = {
+            path: (size, mtime)
+            for path, size, mtime in conn.execute("SELECT path, size, mtime FROM files WHERE dir = ?", (current,))
+        }
+
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except FileNotFoundError:
+            continue
+
+        deferred = False
+        for entry in entries:
+            if entry.name in EXCLUDE_DIRS:
+                continue
+            try:
+                if entry.is_dir():
+                    stack.append((entry.path, current))
+                    continue
+                if not entry.name.lower().endswith(extensions):
+                    continue
+                if entry.path in known and not stat_all:
+                    continue
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if st.st_mtime > settle_before:
+                deferred = True
+                continue
+            if known.get(entry.path) != (st.st_size, st.st_mtime):
+                changed.append((entry.path, st.st_size, st.st_mtime))
+
+        # 기록 중인 파일이 있는 폴더는 실제 수정시각 대신 표시값을 남겨 다음 배치에서 다시 나열되게 함
+        # (폴더 자체는 기록해 두어야 상위 폴더가 바뀌지 않아도 하위 폴더로 찾아 들어갈 수 있음)
+        if deferred:
+            dir_updates[current] = (parent, DIR_DIRTY if stat_all and recorded == DIR_DIRTY else DIR_PENDING)
+        else:
+            dir_updates[current] = (parent, dir_mtime)
+
+    return changed, dir_updates
+
+
+def _recheck_failed(conn, kind, changed, settle_before):
+    """
+    실패로 기록된 파일은 수가 적으므로 매 배치마다 다시 stat 하여,
+    제자리에서 고쳐진 파일(폴더 수정시각이 그대로인 경우)도 바로 다시 처리되게 합니다.
+    """
+    seen = {path for path, _, _ in changed}
+    rows = conn.execute(
+        "SELECT path, size, mtime FROM files WHERE kind = ? AND status = 'failed'", (kind,)
+    ).fetchall()
+    for path, size, mtime in rows:
+        if path in seen:
+            continue
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if st.st_mtime <= settle_before and (st.st_size, st.st_mtime) != (size, mtime):
+            changed.append((path, st.st_size, st.st_mtime))
+    return changed
+
+
+def _commit_dirs(conn, dir_updates):
+    """스캔이 끝난 폴더의 수정시각을 기록합니다."""
+    conn.executemany(
+        "INSERT OR REPLACE INTO dirs (path, parent, mtime) VALUES (?, ?, ?)",
+        [(path, parent, mtime) for path, (parent, mtime) in dir_updates.items()]
+    )
+    conn.commit()
+
+
+def _record_file(conn, path, kind, root, size, mtime, status):
+    """파일의 크기/수정시각과 처리 상태를 기록합니다."""
+    conn.execute(
+        "INSERT OR REPLACE INTO files (path, kind, dir, key, stem, size, mtime, status) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            path, kind, os.path.dirname(path), _rel_key(path, root),
+            os.path.splitext(os.path.basename(path))[0], size, mtime, status
+        )
+    )
+
+
+def _set_status(conn, path, status):
+    """기록된 파일의 처리 상태만 바꿉니다."""
+    conn.execute("UPDATE files SET status = ? WHERE path = ?", (status, path))
+
+
+def _assign_split(name, split_ratio):
+    """
+    이름의 해시값으로 split을 결정합니다.
+    같은 이름은 항상 같은 split에 배정되므로 재실행해도 결과가 바뀌지 않습니다.
+    """
+    r = int(hashlib.md5(name.encode('utf-8')).hexdigest()[:8], 16) / 0xFFFFFFFF
+    if r < split_ratio[0]:
+        return "train"
+    if r < split_ratio[0] + split_ratio[1]:
+        return "val"
+    return "test"
+
+
+def _next_id(conn, json_output_dir):
+    """
+    이미 사용된 ID 다음 번호를 반환합니다.
+    DB가 비어 있을 때만 기존 jsons/ 출력(일괄 처리 결과)을 확인하여 ID 충돌을 막습니다.
+    """
+    row = conn.execute("SELECT MAX(nwpu_id) FROM items").fetchone()
+    if row[0] is not None:
+        return row[0] + 1
+
+    max_id = 0
+    if os.path.isdir(json_output_dir):
+        for f in os.listdir(json_output_dir):
+            stem = os.path.splitext(f)[0]
+            if stem.isdigit():
+                max_id = max(max_id, int(stem))
+    return max_id + 1
+
+
+def _tail_split_ids(split_file, n_lines):
+    """
+    split 파일 끝의 최대 n_lines 줄에서 ID 집합을 읽습니다.
+    새 ID는 항상 파일 끝에 이어쓰므로, 직전 배치에서 기록이 끝나지 않은 ID는 이 범위 안에 있습니다.
+    """
+    if not os.path.exists(split_file):
+        return set()
+
+    with open(split_file, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        start = max(0, size - n_lines * SPLIT_LINE_MAX_BYTES)
+        f.seek(start)
+        lines = f.read().decode('utf-8').splitlines()
+
+    if start > 0 and lines:
+        lines = lines[1:]  # 중간에서 잘린 첫 줄은 버림
+    return {int(line.split()[0]) for line in lines if line.strip()}
+
+
+def _load_label(label_path):
+    """라벨 JSON을 읽고 점 좌표 형식을 검증합니다."""
+    with open(label_path, 'r') as f:
+        data = json.load(f)
+
+    points = data.get('points')
+    if not isinstance(points, list) or any(not isinstance(p, list) or len(p) != 2 for p in points):
+        raise ValueError("'points'는 [x, y] 좌표 목록이어야 합니다.")
+    return data
+
+
+def _tmp_path(dst_path):
+    """확장자를 유지한 임시 파일 경로를 반환합니다. (savemat은 .mat로 끝나지 않으면 확장자를 덧붙임)"""
+    base, ext = os.path.splitext(dst_path)
+    return f"{base}.tmp{ext}"
+
+
+def _write_image(image_path, dst_path):
+    """이미지를 출력 폴더에 복사합니다. JPG가 아니면 변환하여 저장합니다."""
+    if image_path.lower().endswith(('.jpg', '.jpeg')):
+        shutil.copyfile(image_path, dst_path)
+    else:
+        with Image.open(image_path) as img:
+            img.convert('RGB').save(dst_path, 'JPEG')
+
+
+def _write_label(data, json_dst, mat_dst, new_name):
+    """라벨 데이터의 img_id를 새 이름으로 바꿔 JSON으로 저장하고 MAT 파일을 생성합니다."""
+    data = dict(data, img_id=f"{new_name}.jpg")
+
+    with open(json_dst, 'w') as f:
+        json.dump(data, f, indent=4)
+    save_annotation_mat(data, mat_dst)
+
+
+def _resolve_label(conn, image_key, image_stem, item):
+    """
+    이미지에 대응하는 라벨 경로를 찾습니다.
+    같은 상대 경로의 라벨(TEST001/cam_frame0.json)을 우선하고,
+    없으면 이미 연결된 라벨 또는 평평한 라벨 폴더의 같은 파일명(cam_frame0.json)을 사용합니다.
+
+    Returns:
+        tuple: (라벨 경로 또는 None, 평평한 라벨 여부)
+    """
+    row = conn.execute(
+        "SELECT path FROM files WHERE kind = 'label' AND key = ? AND status != 'failed'", (image_key,)
+    ).fetchone()
+    if row:
+        return row[0], False
+
+    if item is not None:
+        return item[3], True
+
+    row = conn.execute(
+        "SELECT path FROM files WHERE kind = 'label' AND key = ? AND status != 'failed'", (image_stem,)
+    ).fetchone()
+    return (row[0], True) if row else (None, False)
+
+
+def run_ingest_once(
+    conn,
+    video_input_dir,
+    frame_output_dir,
+    label_folder,
+    output_path,
+    split_ratio=[0.9, 0.1, 0.0],
+    part_size=1000,
+    interval_seconds=30,
+    settle_seconds=60,
+    full_scan=False
+):
+    """
+    입력 폴더들을 한 번 스캔하여 새로 들어오거나 변경된 항목만 처리합니다.
+    비디오 -> 프레임 추출, 이미지/라벨 -> NWPU 형식(images_partN, jsons, mats, split txt) 순으로 진행하며
+    이미 배정된 ID는 절대 다시 매기지 않습니다.
+
+    항목은 frame_output_dir 기준 상대 경로(예: TEST001/cam_frame0)로 구분하므로,
+    다른 TEST 폴더에 같은 이름의 비디오가 있어도 프레임이 서로 덮어쓰지 않습니다.
+    라벨은 같은 상대 경로(label_folder/TEST001/cam_frame0.json)를 우선 찾고, 없으면 평평한 라벨
+    (label_folder/cam_frame0.json)을 사용하되 같은 파일명의 이미지가 여러 개면 실패로 기록합니다.
+
+    Args:
+        conn (sqlite3.Connection): open_state_db로 연 상태 DB
+        video_input_dir (str): TEST00x 폴더가 있는 비디오 입력 디렉토리 (None이면 비디오 단계 생략)
+        frame_output_dir (str): 추출 프레임(어노테이션 대상 이미지)이 저장되는 디렉토리
+        label_folder (str): 어노테이션 JSON이 들어오는 폴더
+        output_path (str): NWPU 형식 결과를 저장할 경로
+        split_ratio (list): train, val, test 비율
+        part_size (int): images_partN 폴더 하나에 들어갈 이미지 수
+        interval_seconds (int): 프레임을 추출할 시간 간격(초)
+        settle_seconds (int): 마지막 수정 후 이 시간이 지나야 파일을 처리 (복사 중인 파일 방지)
+        full_scan (bool): True면 모든 폴더/파일을 다시 확인하고 짝을 기다리는 이미지도 다시 검사
+
+    Returns:
+        dict: 이번 배치의 처리 통계
+    """
+    stats = {"videos": 0, "new_items": 0, "updated_items": 0, "failed": 0}
+    settle_before = time.time() - settle_seconds
+
+    # 1. 새 비디오 프레임 추출
+    if video_input_dir and os.path.isdir(video_input_dir):
+        videos, video_dirs = _scan(conn, video_input_dir, ('.mp4',), settle_before, full_scan)
+        videos = _recheck_failed(conn, 'video', videos, settle_before)
+        for video_path, size, mtime in sorted(videos):
+            test_folder = os.path.relpath(video_path, video_input_dir).split(os.sep)[0]
+            if not test_folder.startswith("TEST"):
+                continue
+
+            try:
+                saved_count = extract_frames(video_path, os.path.join(frame_output_dir, test_folder), interval_seconds)
+            except Exception as e:
+                logger.error(f"프레임 추출 실패 ({video_path}): {str(e)}")
+                saved_count = 0
+
+            if saved_count:
+                _record_file(conn, video_path, 'video', video_input_dir, size, mtime, 'done')
+                # 같은 이름의 프레임이 제자리에서 덮어써졌을 수 있으므로 다음 스캔에서 폴더 전체를 다시 확인
+                conn.execute(
+                    "UPDATE dirs SET mtime = ? WHERE path = ?",
+                    (DIR_DIRTY, os.path.join(frame_output_dir, test_folder))
+                )
+                stats["videos"] += 1
+            else:
+                logger.warning(f"추출된 프레임이 없습니다. 파일이 바뀔 때까지 다시 시도하지 않습니다: {video_path}")
+                _record_file(conn, video_path, 'video', video_input_dir, size, mtime, 'failed')
+                stats["failed"] += 1
+            conn.commit()
+        _commit_dirs(conn, video_dirs)
+
+    # 2. 이미지/라벨 변경 확인 및 기록
+    new_images, image_dirs = _scan(conn, frame_output_dir, IMAGE_EXTENSIONS, settle_before, full_scan)
+    new_labels, label_dirs = _scan(conn, label_folder, ('.json',), settle_before, full_scan)
+    new_images = _recheck_failed(conn, 'image', new_images, settle_before)
+    new_labels = _recheck_failed(conn, 'label', new_labels, settle_before)
+    changed_images = {path for path, _, _ in new_images}
+    changed_labels = {path for path, _, _ in new_labels}
+
+    for path, size, mtime in new_images:
+        _record_file(conn, path, 'image', frame_output_dir, size, mtime, 'pending')
+    for path, size, mtime in new_labels:
+        _record_file(conn, path, 'label', label_folder, size, mtime, 'pending')
+
+    # 바뀐 이미지와, 바뀐 라벨에 연결될 수 있는 이미지만 다시 검사
+    affected = set(changed_images)
+    for label_path in changed_labels:
+        label_key = _rel_key(label_path, label_folder)
+        column = 'key' if '/' in label_key else 'stem'
+        affected.update(
+            path for (path,) in conn.execute(
+                f"SELECT path FROM files WHERE kind = 'image' AND {column} = ?", (label_key,)
+            )
+        )
+        affected.update(
+            path for (path,) in conn.execute("SELECT image_path FROM items WHERE label_path = ?", (label_path,))
+        )
+    if full_scan:
+        # 중단 등으로 짝이 도착했는데도 처리되지 못한 이미지를 다시 검사
+        affected.update(
+            path for (path,) in conn.execute("SELECT path FROM files WHERE kind = 'image' AND status = 'pending'")
+        )
+
+    # 3. 변경분만 NWPU 형식으로 변환
+    json_output_dir = os.path.join(output_path, 'jsons')
+    mat_output_dir = os.path.join(output_path, 'mats')
+    os.makedirs(json_output_dir, exist_ok=True)
+    os.makedirs(mat_output_dir, exist_ok=True)
+
+    next_id = _next_id(conn, json_output_dir)
+    for image_path in sorted(affected):
+        row = conn.execute("SELECT key, stem FROM files WHERE path = ?", (image_path,)).fetchone()
+        if row is None:
+            continue
+        key, stem = row
+
+        item = conn.execute(
+            "SELECT name, nwpu_id, image_path, label_path FROM items WHERE name = ?", (key,)
+        ).fetchone()
+        label_path, is_flat = _resolve_label(conn, key, stem, item)
+        if label_path is None:
+            continue
+
+        # 평평한 라벨은 같은 파일명의 이미지가 하나뿐이고 다른 항목에 연결되지 않았을 때만 사용
+        if item is None and is_flat:
+            bound = conn.execute("SELECT name FROM items WHERE label_path = ?", (label_path,)).fetchone()
+            same_stem = conn.execute(
+                "SELECT COUNT(*) FROM files WHERE kind = 'image' AND stem = ?", (stem,)
+            ).fetchone()[0]
+            if bound or same_stem > 1:
+                logger.warning(
+                    f"같은 파일명의 이미지가 여러 개라 라벨을 연결할 수 없습니다 ({key} <- {label_path}). "
+                    f"라벨을 {key}.json 경로에 두면 처리됩니다."
+                )
+                _set_status(conn, image_path, 'failed')
+                conn.commit()
+                stats["failed"] += 1
+                continue
+
+        is_new = item is None
+        need_image = is_new or image_path in changed_images or item[2] != image_path
+        need_label = is_new or label_path in changed_labels or item[3] != label_path
+        if not (need_image or need_label):
+            continue
+
+        # 라벨을 먼저 읽고 검증하여, 잘못된 라벨 때문에 이미지를 복사하거나 고아 이미지를 남기지 않음
+        data = None
+        if need_label:
+            try:
+                data = _load_label(label_path)
+            except Exception as e:
+                logger.error(f"라벨 오류 ({label_path}): {str(e)}. 파일이 바뀔 때까지 다시 시도하지 않습니다.")
+                _set_status(conn, label_path, 'failed')
+                conn.commit()
+                stats["failed"] += 1
+                continue
+
+        nwpu_id = next_id if is_new else item[1]
+        new_name = f"{nwpu_id:04d}"
+        part_dir = os.path.join(output_path, f"images_part{(nwpu_id - 1) // part_size + 1}")
+        json_dst = os.path.join(json_output_dir, f"{new_name}.json")
+        mat_dst = os.path.join(mat_output_dir, f"{new_name}.mat")
+        image_dst = os.path.join(part_dir, f"{new_name}.jpg")
+        outputs = ([json_dst, mat_dst] if need_label else []) + ([image_dst] if need_image else [])
+
+        # 임시 파일에 모두 쓴 뒤, 성공한 경우에만 최종 이름으로 교체
+        failed_source = label_path
+        try:
+            if need_label:
+                _write_label(data, _tmp_path(json_dst), _tmp_path(mat_dst), new_name)
+            if need_image:
+                failed_source = image_path
+                os.makedirs(part_dir, exist_ok=True)
+                _write_image(image_path, _tmp_path(image_dst))
+        except Exception as e:
+            logger.error(f"오류 발생 ({failed_source}): {str(e)}. 파일이 바뀔 때까지 다시 시도하지 않습니다.")
+            for dst in outputs:
+                if os.path.exists(_tmp_path(dst)):
+                    os.remove(_tmp_path(dst))
+            _set_status(conn, failed_source, 'failed')
+            conn.commit()
+            stats["failed"] += 1
+            continue
+
+        for dst in outputs:
+            os.replace(_tmp_path(dst), dst)
+
+        if is_new:
+            conn.execute(
+                "INSERT INTO items (name, nwpu_id, split, image_path, label_path) VALUES (?, ?, ?, ?, ?)",
+                (key, nwpu_id, _assign_split(key, split_ratio), image_path, label_path)
+            )
+            next_id += 1
+            stats["new_items"] += 1
+        else:
+            conn.execute(
+                "UPDATE items SET image_path = ?, label_path = ? WHERE name = ?",
+                (image_path, label_path, key)
+            )
+            stats["updated_items"] += 1
+
+        _set_status(conn, image_path, 'done')
+        _set_status(conn, label_path, 'done')
+        conn.commit()
+
+    # 짝이 없는 이미지/라벨은 pending으로 남아, 짝이 도착하는 배치에서 함께 처리됨
+    conn.commit()
+    _commit_dirs(conn, image_dirs)
+    _commit_dirs(conn, label_dirs)
+
+    # 4. split 파일에 새 ID만 이어쓰기
+    # 이어쓰기 후 split_written 갱신 전에 중단되었던 경우, 파일 끝에 이미 있는 ID는 다시 쓰지 않음
+    pending = conn.execute(
+        "SELECT nwpu_id, split FROM items WHERE split_written = 0 ORDER BY nwpu_id"
+    ).fetchall()
+    for split_name in SPLIT_NAMES:
+        ids = [nwpu_id for nwpu_id, split in pending if split == split_name]
+        if not ids:
+            continue
+        split_file = os.path.join(output_path, f"{split_name}.txt")
+        written = _tail_split_ids(split_file, len(ids))
+        with open(split_file, "a") as f:
+            for nwpu_id in ids:
+                if nwpu_id not in written:
+                    f.write(f"{nwpu_id:04d} 0 0\n")
+    conn.executemany(
+        "UPDATE items SET split_written = 1 WHERE nwpu_id = ?",
+        [(nwpu_id,) for nwpu_id, _ in pending]
+    )
+    conn.commit()
+
+    if any(stats.values()):
+        logger.info(
+            f"배치 처리 완료 - 비디오: {stats['videos']}개, "
+            f"신규: {stats['new_items']}개, 갱신: {stats['updated_items']}개, 실패: {stats['failed']}개"
+        )
+    return stats
+
+
+def watch_and_ingest(
+    video_input_dir,
+    frame_output_dir,
+    label_folder,
+    output_path,
+    split_ratio=[0.9, 0.1, 0.0],
+    part_size=1000,
+    interval_seconds=30,
+    poll_seconds=30,
+    settle_seconds=60,
+    full_scan_every=120,
+    state_db=None
+):
+    """
+    입력 폴더들을 주기적으로 폴링하며 새 비디오/이미지/라벨을 증분 처리하는 장기 실행 모드입니다.
+    Ctrl+C로 종료하며, 처리 이력은 상태 DB에 남아 재시작 시 이어서 처리합니다.
+    시작 시와 full_scan_every 폴링마다 전체 스캔을 하여, 폴더 수정시각이 바뀌지 않는
+    제자리 수정(예: 라벨 파일 덮어쓰기)도 반영합니다.
+
+    Args:
+        video_input_dir (str): TEST00x 폴더가 있는 비디오 입력 디렉토리
+        frame_output_dir (str): 추출 프레임(어노테이션 대상 이미지)이 저장되는 디렉토리
+        label_folder (str): 어노테이션 JSON이 들어오는 폴더
+        output_path (str): NWPU 형식 결과를 저장할 경로
+        split_ratio (list): train, val, test 비율
+        part_size (int): images_partN 폴더 하나에 들어갈 이미지 수
+        interval_seconds (int): 프레임을 추출할 시간 간격(초)
+        poll_seconds (int): 폴링 주기(초)
+        settle_seconds (int): 마지막 수정 후 이 시간이 지나야 파일을 처리
+        full_scan_every (int): 전체 스캔 주기(폴링 횟수, 0이면 시작 시 한 번만)
+        state_db (str): 상태 DB 경로 (기본값: output_path/ingest_state.sqlite3)
+
+    Returns:
+        dict: 누적 처리 통계 또는 에러 정보
+    """
+    if len(split_ratio) != 3 or abs(sum(split_ratio) - 1.0) > 1e-6:
+        logger.error(f"분할 비율이 잘못되었습니다. 세 값의 합이 1.0이어야 합니다: {split_ratio}")
+        return {"error": f"분할 비율이 잘못되었습니다. 세 값의 합이 1.0이어야 합니다: {split_ratio}"}
+
+    os.makedirs(output_path, exist_ok=True)
+    os.makedirs(frame_output_dir, exist_ok=True)
+    try:
+        conn = open_state_db(state_db or os.path.join(output_path, 'ingest_state.sqlite3'))
+    except ValueError as e:
+        logger.error(str(e))
+        return {"error": str(e)}
+
+    totals = {"videos": 0, "new_items": 0, "updated_items": 0, "failed": 0}
+    polls = 0
+    full_scan = True
+    logger.info(f"증분 수집 모드 시작 ({poll_seconds}초 간격). 종료하려면 Ctrl+C")
+    try:
+        while True:
+            try:
+                stats = run_ingest_once(
+                    conn, video_input_dir, frame_output_dir, label_folder, output_path,
+                    split_ratio=split_ratio,
+                    part_size=part_size,
+                    interval_seconds=interval_seconds,
+                    settle_seconds=settle_seconds,
+                    full_scan=full_scan
+                )
+                for key in totals:
+                    totals[key] += stats[key]
+                polls += 1
+                full_scan = bool(full_scan_every) and polls % full_scan_every == 0
+            except Exception as e:
+                # 한 번의 폴링 실패로 감시 모드 전체가 종료되지 않도록 기록 후 다음 폴링으로 넘어감.
+                # 중간에 멈춘 항목을 놓치지 않도록 다음 폴링은 전체 스캔으로 진행
+                logger.error(f"배치 처리 중 오류 발생: {str(e)}")
+                conn.rollback()
+                full_scan = True
+            time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        logger.info(f"증분 수집 모드 종료 - 누적 {totals}")
+    finally:
+        conn.close()
+
+    return totals
@@ -7,6 +7,25 @@ from utils.logger import custom_logger
 
 logger = custom_logger(__name__)
 
+def save_annotation_mat(data, mat_file):
+    """
+    JSON 라벨 데이터(dict)를 MAT 파일로 저장합니다.
+    
+    Args:
+        data (dict): 'points' (및 선택적으로 'boxes') 키를 가진 라벨 데이터
+        mat_file (str): 저장할 MAT 파일 경로
+    
+    Returns:
+        None
+    """
+    points = np.array(data['points'], dtype=np.float32)
+    boxes = np.array(data['boxes'], dtype=np.float32) if 'boxes' in data else np.array([])
+    
+    savemat(mat_file, {
+        'annPoints': points,
+        'annBoxes': boxes
+    })
+
 def convert_json_to_mat(json_folder, output_base_path):
     """
     JSON 파일들을 MAT 파일로 변환합니다.
@@ -33,13 +52,7 @@ def convert_json_to_mat(json_folder, output_base_path):
             with open(json_file, 'r') as f:
                 data = json.load(f)
             
-            points = np.array(data['points'], dtype=np.float32)
-            boxes = np.array(data['boxes'], dtype=np.float32) if 'boxes' in data else np.array([])
-            
-            savemat(mat_file, {
-                'annPoints': points,
-                'annBoxes': boxes
-            })
+            save_annotation_mat(data, mat_file)
             
             logger.info(f"변환 완료: {filename} -> {basename}.mat")
             
@@ -0,0 +1,256 @@
+import os
+import json
+import numpy as np
+import cv2
+from scipy.io import loadmat
+from concurrent.futures import ProcessPoolExecutor
+from utils.logger import custom_logger
+from utils.except_dir import cust_listdir
+from utils.image_files import collect_images
+from config.config import SPLIT_NAMES
+
+logger = custom_logger(__name__)
+
+# JPEG DCT 단계에서 바로 축소 디코딩하는 플래그 (전체 해상도 디코딩을 피함)
+REDUCED_READ_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+POINT_COLOR = (0, 0, 255)
+BOX_COLOR = (0, 255, 0)
+BANNER_HEIGHT = 28
+
+
+def load_annotation(label_path):
+    """
+    JSON 또는 MAT 라벨 파일에서 점/박스 좌표를 읽어옵니다.
+
+    Args:
+        label_path (str): .json 또는 .mat 라벨 파일 경로
+
+    Returns:
+        tuple: (points (N, 2) float32, boxes (M, 4) float32)
+    """
+    if label_path.endswith('.mat'):
+        data = loadmat(label_path)
+        points = data.get('annPoints', np.zeros((0, 2)))
+        boxes = data.get('annBoxes', np.zeros((0, 4)))
+    else:
+        with open(label_path, 'r') as f:
+            data = json.load(f)
+        points = data.get('points', [])
+        boxes = data.get('boxes', [])
+
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    return points, boxes
+
+
+def _disk_offsets(radius):
+    """반지름 radius 원 내부의 (dy, dx) 오프셋을 반환합니다."""
+    r = np.arange(-radius, radius + 1)
+    dy, dx = np.meshgrid(r, r, indexing='ij')
+    mask = dy ** 2 + dx ** 2 <= radius ** 2
+    return dy[mask], dx[mask]
+
+
+def draw_overlay(img, points, boxes, scale, title, point_radius=2):
+    """
+    축소된 이미지 위에 점, 박스, 카운트 배너를 그립니다.
+    점은 루프 없이 팬시 인덱싱으로, 박스는 단일 polylines 호출로 그립니다.
+
+    Args:
+        img (np.ndarray): BGR 이미지 (in-place 수정)
+        points (np.ndarray): 원본 해상도 기준 점 좌표 (N, 2)
+        boxes (np.ndarray): 원본 해상도 기준 박스 좌표 (M, 4) x1, y1, x2, y2
+        scale (float): 원본 -> 축소 이미지 좌표 배율
+        title (str): 배너에 표시할 이름
+        point_radius (int): 점 반지름(픽셀)
+
+    Returns:
+        np.ndarray: 오버레이가 그려진 이미지
+    """
+    h, w = img.shape[:2]
+
+    if len(boxes):
+        b = np.rint(boxes * scale).astype(np.int32)
+        corners = np.stack([
+            b[:, [0, 1]], b[:, [2, 1]], b[:, [2, 3]], b[:, [0, 3]]
+        ], axis=1)
+        cv2.polylines(img, list(corners), True, BOX_COLOR, 1, lineType=cv2.LINE_8)
+
+    if len(points):
+        p = np.rint(points * scale).astype(np.int64)
+        dy, dx = _disk_offsets(point_radius)
+        ys = np.clip(p[:, 1:2] + dy[None, :], 0, h - 1).ravel()
+        xs = np.clip(p[:, 0:1] + dx[None, :], 0, w - 1).ravel()
+        img[ys, xs] = POINT_COLOR
+
+    img[:BANNER_HEIGHT] = (img[:BANNER_HEIGHT] * 0.4).astype(np.uint8)
+    cv2.putText(img, f"{title} | count: {len(points)}", (6, BANNER_HEIGHT - 8),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
+    return img
+
+
+def _render_one(task):
+    """워커 프로세스에서 이미지 한 장의 오버레이를 렌더링합니다."""
+    image_path, label_path, save_path, reduce_factor, jpeg_quality = task
+    cv2.setNumThreads(1)
+
+    img = cv2.imread(image_path, REDUCED_READ_FLAGS[reduce_factor])
+    if img is None:
+        return image_path, f"이미지를 읽을 수 없습니다: {image_path}"
+
+    try:
+        points, boxes = load_annotation(label_path)
+    except Exception as e:
+        return image_path, f"라벨 로드 실패 ({label_path}): {e}"
+
+    name = os.path.splitext(os.path.basename(image_path))[0]
+    draw_overlay(img, points, boxes, 1.0 / reduce_factor, name)
+    cv2.imwrite(save_path, img, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    return image_path, None
+
+
+def _build_sheet(task):
+    """워커 프로세스에서 오버레이 이미지들을 하나의 컨택트 시트로 타일링합니다."""
+    overlay_paths, save_path, cols, thumb_width, jpeg_quality = task
+    cv2.setNumThreads(1)
+
+    thumbs = []
+    for path in overlay_paths:
+        img = cv2.imread(path, cv2.IMREAD_REDUCED_COLOR_2)
+        if img is None:
+            continue
+        h, w = img.shape[:2]
+        thumb_height = max(1, int(round(h * thumb_width / w)))
+        thumbs.append(cv2.resize(img, (thumb_width, thumb_height), interpolation=cv2.INTER_AREA))
+
+    if not thumbs:
+        return save_path, "시트에 포함할 이미지가 없습니다."
+
+    cell_h = max(t.shape[0] for t in thumbs)
+    rows = (len(thumbs) + cols - 1) // cols
+    sheet = np.zeros((rows * cell_h, cols * thumb_width, 3), dtype=np.uint8)
+    for i, t in enumerate(thumbs):
+        r, c = divmod(i, cols)
+        sheet[r * cell_h:r * cell_h + t.shape[0], c * thumb_width:(c + 1) * thumb_width] = t
+
+    cv2.imwrite(save_path, sheet, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    return save_path, None
+
+
+def _read_split(split_file):
+    """NWPU 형식 분할 파일("0001 0 0")에서 ID 목록을 읽습니다."""
+    with open(split_file, 'r') as f:
+        return [line.split()[0] for line in f if line.strip()]
+
+
+def render_qa_overlays(
+    image_folders,
+    label_folder,
+    output_path,
+    reduce_factor=4,
+    num_workers=None,
+    contact_sheet=False,
+    sheet_cols=6,
+    sheet_rows=6,
+    thumb_width=320,
+    jpeg_quality=85
+):
+    """
+    라벨 품질 검수를 위해 축소된 이미지 위에 점/박스/카운트 배너를 그려 저장합니다.
+    JPEG 축소 디코딩과 프로세스 풀을 사용하며, 선택적으로 split별 컨택트 시트를 만듭니다.
+
+    Args:
+        image_folders (str | list): 이미지 폴더 경로 (images_part1, images_part2 ... 여러 개 가능)
+        label_folder (str): jsons/ 또는 mats/ 폴더 경로
+        output_path (str): 결과를 저장할 기본 경로 (qa_overlays/, qa_sheets/ 생성)
+        reduce_factor (int): 디코딩 축소 배율 (1, 2, 4, 8)
+        num_workers (int): 워커 프로세스 수 (None이면 CPU 수)
+        contact_sheet (bool): output_path의 train/val/test.txt 기준 컨택트 시트 생성 여부
+        sheet_cols (int): 시트 한 장의 열 수
+        sheet_rows (int): 시트 한 장의 행 수
+        thumb_width (int): 시트 내 썸네일 너비(픽셀)
+        jpeg_quality (int): 저장 JPEG 품질
+
+    Returns:
+        dict: 처리 결과 및 통계 정보
+    """
+    if reduce_factor not in REDUCED_READ_FLAGS:
+        logger.error(f"reduce_factor는 {sorted(REDUCED_READ_FLAGS)} 중 하나여야 합니다: {reduce_factor}")
+        return {"error": f"reduce_factor는 {sorted(REDUCED_READ_FLAGS)} 중 하나여야 합니다: {reduce_factor}"}
+
+    if not os.path.exists(label_folder):
+        logger.error(f"라벨 폴더가 존재하지 않습니다: {label_folder}")
+        return {"error": f"라벨 폴더가 존재하지 않습니다: {label_folder}"}
+
+    overlay_folder = os.path.join(output_path, 'qa_overlays')
+    os.makedirs(overlay_folder, exist_ok=True)
+
+    images = collect_images(image_folders)
+    labels = {
+        os.path.splitext(f)[0]: os.path.join(label_folder, f)
+        for f in cust_listdir(label_folder) if f.endswith(('.json', '.mat'))
+    }
+
+    common_names = sorted(set(images) & set(labels))
+    if not common_names:
+        logger.error("이미지와 라벨 파일이 일치하는 것이 없습니다.")
+        return {"error": "이미지와 라벨 파일이 일치하는 것이 없습니다."}
+
+    logger.info(f"QA 오버레이 렌더링 중... ({len(common_names)}개, 1/{reduce_factor} 축소)")
+
+    tasks = [
+        (images[name], labels[name], os.path.join(overlay_folder, f"{name}.jpg"), reduce_factor, jpeg_quality)
+        for name in common_names
+    ]
+
+    num_workers = num_workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (num_workers * 8))
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for image_path, error in executor.map(_render_one, tasks, chunksize=chunksize):
+            if error:
+                failed += 1
+                logger.warning(error)
+
+        sheets = []
+        if contact_sheet:
+            per_sheet = sheet_cols * sheet_rows
+            sheet_folder = os.path.join(output_path, 'qa_sheets')
+            os.makedirs(sheet_folder, exist_ok=True)
+
+            sheet_tasks = []
+            for split_name in SPLIT_NAMES:
+                split_file = os.path.join(output_path, f"{split_name}.txt")
+                if not os.path.exists(split_file):
+                    continue
+
+                overlay_paths = [
+                    os.path.join(overlay_folder, f"{name}.jpg")
+                    for name in _read_split(split_file) if name in labels and name in images
+                ]
+                for k in range(0, len(overlay_paths), per_sheet):
+                    save_path = os.path.join(sheet_folder, f"{split_name}_{k // per_sheet + 1:03d}.jpg")
+                    sheet_tasks.append((overlay_paths[k:k + per_sheet], save_path, sheet_cols, thumb_width, jpeg_quality))
+
+            for save_path, error in executor.map(_build_sheet, sheet_tasks):
+                if error:
+                    logger.warning(f"{save_path}: {error}")
+                else:
+                    sheets.append(save_path)
+
+            logger.info(f"컨택트 시트 {len(sheets)}장 생성됨. 결과는 {sheet_folder}에 저장되었습니다.")
+
+    logger.info(f"총 {len(tasks) - failed}개 오버레이 생성, {failed}개 실패. 결과는 {overlay_folder}에 저장되었습니다.")
+
+    return {
+        "rendered": len(tasks) - failed,
+        "failed": failed,
+        "sheets": sheets
+    }
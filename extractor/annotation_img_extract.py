@@ -10,18 +10,27 @@ def extract_frames(video_path: str, output_dir: str, interval_seconds: int = 30)
         video_path (str): 비디오 파일 경로
         output_dir (str): 추출된 프레임을 저장할 디렉토리
         interval_seconds (int): 프레임을 추출할 시간 간격(초)
+    
+    Returns:
+        int: 저장된 프레임 수 (비디오를 열 수 없거나 FPS 정보가 없으면 0)
     """
     video_name = os.path.splitext(os.path.basename(video_path))[0]
     cap = cv2.VideoCapture(video_path)
     
     if not cap.isOpened():
         print(f"Error: 비디오 파일을 열 수 없습니다: {video_path}")
-        return
+        return 0
     
     fps = cap.get(cv2.CAP_PROP_FPS)
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     frame_interval = int(fps * interval_seconds)
     
+    # 손상되거나 잘린 파일은 FPS가 0으로 읽혀 추출 간격을 계산할 수 없음
+    if frame_interval <= 0:
+        print(f"Error: 비디오 FPS 정보가 올바르지 않습니다 (FPS: {fps}): {video_path}")
+        cap.release()
+        return 0
+    
     print(f"Processing {video_path} - FPS: {fps}, Total frames: {total_frames}")
     print(f"Extracting frames every {interval_seconds} seconds ({frame_interval} frames)")
     
@@ -46,6 +55,7 @@ def extract_frames(video_path: str, output_dir: str, interval_seconds: int = 30)
     
     cap.release()
     print(f"Completed extracting {saved_count} frames from {video_path}")
+    return saved_count
 
 
 def extract_incheon_airport_annotation_images(input_dir: str, output_dir: str = "annotations", interval_seconds: int = 30):
@@ -0,0 +1,18 @@
+from custom.custom_incremental_ingest import watch_and_ingest
+
+VIDEO_INPUT_PATH = "videos"
+FRAME_OUTPUT_PATH = "annotations"
+LABEL_FOLDER_PATH = "labels"
+OUTPUT_PATH = "Incheon_to_NWPU"
+SPLIT_RATIO = [0.9, 0.1, 0.0]
+POLL_SECONDS = 30
+
+if __name__ == "__main__":
+    watch_and_ingest(
+        video_input_dir=VIDEO_INPUT_PATH,
+        frame_output_dir=FRAME_OUTPUT_PATH,
+        label_folder=LABEL_FOLDER_PATH,
+        output_path=OUTPUT_PATH,
+        split_ratio=SPLIT_RATIO,
+        poll_seconds=POLL_SECONDS
+    )
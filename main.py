@@ -1,10 +1,14 @@
 from custom.custom_rename_split import process_dataset
 from custom.custom_json_to_mat import convert_json_to_mat
+from custom.custom_qa_overlay import render_qa_overlays
+from custom.custom_count_integral import build_count_integrals
 
 IMAGE_FOLDER_PATH = "sample/sample_images_part1"
 LABEL_FOLDER_PATH = "sample/jsons"
 OUTPUT_PATH = "sample/"
 SPLIT_RATIO = [0.9, 0.1, 0.0]
+QA_OVERLAY = False
+COUNT_INTEGRAL = False
 
 if __name__ == "__main__":
     process_dataset(
@@ -14,4 +18,8 @@ if __name__ == "__main__":
         split_ratio= SPLIT_RATIO
     )
     convert_json_to_mat(LABEL_FOLDER_PATH, OUTPUT_PATH)
-    
\ No newline at end of file
+    
+    if QA_OVERLAY:
+        render_qa_overlays(IMAGE_FOLDER_PATH, LABEL_FOLDER_PATH, OUTPUT_PATH, contact_sheet=True)
+    if COUNT_INTEGRAL:
+        build_count_integrals(IMAGE_FOLDER_PATH, OUTPUT_PATH)
@@ -0,0 +1,25 @@
+import os
+from typing import Dict, List, Union
+from utils.except_dir import cust_listdir
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+def collect_images(image_folders: Union[str, List[str]]) -> Dict[str, str]:
+    """
+    이미지 폴더(들)에서 파일명(확장자 제외) -> 이미지 경로 매핑을 만듭니다.
+    
+    Args:
+        image_folders (str | list): 이미지 폴더 경로 (images_part1, images_part2 ... 여러 개 가능)
+        
+    Returns:
+        Dict[str, str]: {파일명(확장자 제외): 이미지 경로}
+    """
+    if isinstance(image_folders, str):
+        image_folders = [image_folders]
+
+    images = {}
+    for folder in image_folders:
+        for file in cust_listdir(folder):
+            if file.lower().endswith(IMAGE_EXTENSIONS):
+                images[os.path.splitext(file)[0]] = os.path.join(folder, file)
+    return images